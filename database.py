@@ -0,0 +1,124 @@
+"""Connection pooling and air-quality database management."""
+import logging
+import queue
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections checked out by workers."""
+
+    def __init__(self, db_path, pool_size=5, uri=False):
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.uri = uri
+        self.connections = queue.Queue(maxsize=pool_size)
+        self._lock = threading.Lock()
+        for _ in range(pool_size):
+            self.connections.put(self._create_connection())
+
+    def _create_connection(self):
+        return sqlite3.connect(self.db_path, uri=self.uri,
+                               check_same_thread=False)
+
+    def get_connection(self, timeout=5):
+        """Check a connection out of the pool, blocking up to timeout."""
+        return self.connections.get(timeout=timeout)
+
+    def return_connection(self, conn):
+        """Return a checked-out connection to the pool."""
+        self.connections.put(conn)
+
+    def close_all(self):
+        """Close every pooled connection."""
+        with self._lock:
+            while not self.connections.empty():
+                try:
+                    self.connections.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+class DatabaseInitializer:
+    """Creates the air-quality schema on a fresh or existing database."""
+
+    AIR_QUALITY_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS air_quality (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            city TEXT NOT NULL,
+            region TEXT,
+            year INTEGER,
+            month INTEGER,
+            day INTEGER,
+            station TEXT,
+            pm25 REAL,
+            trend TEXT,
+            aqi REAL,
+            co REAL,
+            no2 REAL,
+            frequency TEXT,
+            recorded_at TEXT
+        )
+    """
+
+    @staticmethod
+    def initialize_air_quality_db(db_path, uri=False):
+        """Create the schema and indexes; returns the open connection."""
+        conn = sqlite3.connect(db_path, uri=uri, check_same_thread=False)
+        cursor = conn.cursor()
+        cursor.execute(DatabaseInitializer.AIR_QUALITY_SCHEMA)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_aq_city ON air_quality(city)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_aq_date "
+                       "ON air_quality(year, month, day)")
+        conn.commit()
+        return conn
+
+
+class AirQualityMemory:
+    """Thin storage wrapper over the air_quality table."""
+
+    _INSERT_SQL = (
+        "INSERT INTO air_quality (city, region, year, month, day, station, "
+        "pm25, trend, aqi, co, no2, frequency, recorded_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+    def __init__(self, db_path, uri=False):
+        self.db_path = db_path
+        self.conn = DatabaseInitializer.initialize_air_quality_db(db_path,
+                                                                  uri=uri)
+        self._write_lock = threading.Lock()
+
+    def store_reading(self, row):
+        """Store one 13-column reading tuple."""
+        with self._write_lock:
+            self.conn.execute(self._INSERT_SQL, row)
+            self.conn.commit()
+
+    def store_readings_bulk(self, rows):
+        """Store many reading tuples in one transaction.
+
+        One executemany under a single commit replaces N fsync-serialized
+        single-row commits; returns the number of rows stored.
+        """
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            cursor.executemany(self._INSERT_SQL, rows)
+            self.conn.commit()
+            return cursor.rowcount
+
+    def get_readings(self, city):
+        """Return every reading recorded for a city."""
+        cursor = self.conn.execute(
+            "SELECT * FROM air_quality WHERE city = ?", (city,))
+        return cursor.fetchall()
+
+    def count(self):
+        """Return the number of stored readings."""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM air_quality").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,391 @@
+"""SQLite-backed storage for biographical records.
+
+BiographicalMemory keeps one connection per thread and applies a set of
+performance PRAGMAs so repeated store/retrieve calls stay cheap.
+"""
+import logging
+import operator
+import sqlite3
+import sys
+import threading
+import weakref
+from collections import OrderedDict, deque
+from itertools import islice
+from time import perf_counter_ns
+
+logger = logging.getLogger(__name__)
+
+
+def _close_connections(connections):
+    """Finalizer target: close whatever connections are still open.
+
+    Module-level so the weakref.finalize callback holds no reference back
+    to the BiographicalMemory instance.
+    """
+    for conn, _cursor in connections:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    connections.clear()
+
+
+class BiographicalMemory:
+    """Thread-aware SQLite store for biographical records."""
+
+    # journal_mode is a property of the database file: set it once when the
+    # schema is initialized and every later connection inherits it.
+    _GLOBAL_PRAGMAS = [
+        "PRAGMA journal_mode=WAL",
+    ]
+
+    # These are per-connection settings. Applying them only at init time,
+    # as earlier revisions did, left every other thread's connection on the
+    # library defaults -- synchronous=FULL and a 2 MiB page cache.
+    _PER_CONNECTION_PRAGMAS = [
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+    VALID_COLUMNS = frozenset({'name', 'birth_year', 'birth_place',
+                               'death_year', 'death_place', 'occupation',
+                               'achievement', 'education', 'nationality',
+                               'known_for'})
+
+    _INSERT_SQL = (
+        "INSERT OR REPLACE INTO biographies "
+        "(name, birth_year, birth_place, death_year, death_place, "
+        "occupation, achievement, education, nationality, known_for) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+    # Bind-tuple construction for _INSERT_SQL: a single C-level itemgetter
+    # call replaces ten Python-level dict.get calls per record. Records are
+    # padded with the defaults dict first so missing keys bind as NULL; the
+    # column order here must match _INSERT_SQL's placeholder list.
+    _INSERT_COLUMNS = ('name', 'birth_year', 'birth_place', 'death_year',
+                       'death_place', 'occupation', 'achievement',
+                       'education', 'nationality', 'known_for')
+    _COLUMN_DEFAULTS = dict.fromkeys(_INSERT_COLUMNS)
+    _ROW_GETTER = operator.itemgetter(*_INSERT_COLUMNS)
+
+    # Prebuilt per-field SELECTs: the per-call f-string disappears and the
+    # identical SQL text hits sqlite3's statement cache on every call. The
+    # table is keyed directly by name, so every one of these is a single
+    # B-tree descent with no index to steer.
+    _SELECT_BY_FIELD = {
+        field: f"SELECT {field} FROM biographies WHERE name = ?"
+        for field in VALID_COLUMNS
+    }
+
+    def __init__(self, db_path, collect_metrics=True):
+        self.db_path = db_path
+        # Timing instrumentation can be switched off entirely for callers
+        # that never read get_performance_metrics(), removing the two clock
+        # reads and the deque append from every store/retrieve.
+        self.collect_metrics = collect_metrics
+        # WAL's lock-free concurrent readers only exist across *separate*
+        # page caches: under cache=shared a writer's table lock turns any
+        # plain read into an immediate SQLITE_LOCKED (busy_timeout does
+        # not apply), so file-backed databases pay one private page cache
+        # per connection instead. Explicit URIs pass through untouched --
+        # mode=memory needs cache=shared to be visible across connections
+        # at all. Writers are serialized by our own lock rather than
+        # SQLite's busy-retry loop.
+        if db_path.startswith('file:'):
+            self.db_uri = db_path
+        else:
+            self.db_uri = f"file:{db_path}"
+        self._write_lock = threading.RLock()
+        # Per-thread (connection, cursor) pairs live in a threading.local --
+        # no get_ident() call or dict probe on the hot path -- while a plain
+        # list of every pair ever opened exists solely so close() and the
+        # finalizer can iterate them from whichever thread runs last.
+        self._local = threading.local()
+        self.connections = []
+        # Bumped by close(); threads holding a pair from an earlier epoch
+        # reconnect instead of reusing a closed connection.
+        self._epoch = 0
+        # False until the current epoch's first connection has run the
+        # schema setup; close() resets it so a reconnect re-creates the
+        # schema (an in-memory database dies with its last connection).
+        self._schema_verified = False
+        # GC backstop without __del__: the finalizer keeps instances on
+        # CPython's fast deallocation path and closes whatever is still in
+        # the list when the object dies. close() calls the helper directly
+        # -- a one-shot finalizer would be dead after the first close and
+        # never clean up connections opened by a later reconnect.
+        self._finalizer = weakref.finalize(self, _close_connections,
+                                           self.connections)
+        # LRU cache of (name, field) -> value. Repeated lookups of the same
+        # person skip the whole sqlite3 round-trip; store/batch_store
+        # invalidate the affected names. Readers on other connections that
+        # bypass this instance will not see its entries -- the cache is only
+        # as consistent as the writes that flow through this object. The
+        # OrderedDict is shared by every reader thread, and move_to_end/
+        # popitem interleavings are not atomic, so all cache operations
+        # run under this lock.
+        self._retrieve_cache = OrderedDict()
+        self._retrieve_cache_max = 4096
+        self._cache_lock = threading.Lock()
+        # Bounded ring buffers of per-call durations in nanoseconds.
+        # time.time() resolution (~1 ms on Windows) silently zeroed fast
+        # calls, and unbounded lists leaked in long-running processes.
+        self.metrics = {'store': deque(maxlen=4096),
+                        'retrieve': deque(maxlen=4096),
+                        'batch': deque(maxlen=4096)}
+        # Memory-map the database file only where the platform can honor it:
+        # 1 GiB on 64-bit POSIX, 256 MiB on Windows (smaller usable address
+        # space). 32-bit builds skip mmap rather than asking for more address
+        # space than exists, which SQLite would silently reject anyway.
+        self._per_conn_pragmas = list(self._PER_CONNECTION_PRAGMAS)
+        if sys.maxsize > 2**32:
+            mmap_bytes = 268435456 if sys.platform == 'win32' else 1073741824
+            self._per_conn_pragmas.append(f"PRAGMA mmap_size={mmap_bytes}")
+        # Opening the first connection runs _initialize_db as a side
+        # effect of the new-epoch path.
+        self._get_conn_cursor()
+
+    def get_connection(self):
+        """Return the calling thread's connection, creating it on first use."""
+        return self._get_conn_cursor()[0]
+
+    def _get_conn_cursor(self):
+        """Return the calling thread's (connection, cursor) pair.
+
+        The cursor is allocated once per thread and reused by every
+        operation, instead of paying a fresh cursor allocation per call.
+        It must not be handed across thread boundaries.
+        """
+        local = self._local
+        if getattr(local, 'epoch', -1) != self._epoch:
+            conn = sqlite3.connect(self.db_uri, uri=True,
+                                   check_same_thread=False,
+                                   cached_statements=256,
+                                   isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            for pragma in self._per_conn_pragmas:
+                conn.execute(pragma)
+            local.pair = (conn, conn.cursor())
+            local.epoch = self._epoch
+            self.connections.append(local.pair)
+            if not self._schema_verified:
+                # First connection of this epoch -- a fresh instance or a
+                # reconnect after close(). The schema setup is idempotent:
+                # a no-op against an existing file-backed database, and
+                # the re-creation an in-memory database needs after dying
+                # with its last connection.
+                with self._write_lock:
+                    if not self._schema_verified:
+                        self._initialize_db(local.pair[1])
+        return local.pair
+
+    def _initialize_db(self, cursor):
+        """Create the schema and apply performance PRAGMAs."""
+        # A fresh database can still change its page size; bump it before any
+        # writes so the B-tree is built with fewer, larger pages. Must happen
+        # before journal_mode=WAL freezes the page size.
+        if cursor.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0:
+            cursor.execute("PRAGMA page_size=8192")
+
+        for pragma in self._GLOBAL_PRAGMAS:
+            cursor.execute(pragma)
+
+        # One-time read-back of the mmap request the per-connection pragmas
+        # made; in-memory databases have nothing to map and return no row.
+        granted = cursor.execute("PRAGMA mmap_size").fetchone()
+        if granted is not None and granted[0] <= 0 and sys.maxsize > 2**32:
+            logger.warning(
+                "mmap_size was refused by the kernel; reads will fall "
+                "back to read() syscalls")
+
+        # WITHOUT ROWID keys the row data directly on name: a lookup is one
+        # B-tree descent into the table instead of name-index probe plus
+        # rowid probe, the name is stored once instead of in both the table
+        # and a unique index, and there is no second index to maintain on
+        # insert.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS biographies (
+                name TEXT PRIMARY KEY NOT NULL,
+                birth_year INTEGER,
+                birth_place TEXT,
+                death_year INTEGER,
+                death_place TEXT,
+                occupation TEXT,
+                achievement TEXT,
+                education TEXT,
+                nationality TEXT,
+                known_for TEXT
+            ) WITHOUT ROWID
+        """)
+        # Indexes earlier layouts of this table carried; both are redundant
+        # against the name-keyed primary B-tree.
+        cursor.execute("DROP INDEX IF EXISTS idx_name")
+        cursor.execute("DROP INDEX IF EXISTS idx_name_cover")
+        self._schema_verified = True
+
+    def store(self, name, data):
+        """Store one person's record, replacing any existing row by name.
+
+        Returns the name, which is the table's primary key and the handle
+        every other operation takes.
+        """
+        if not name or not isinstance(name, str):
+            raise ValueError("Name must be a non-empty string")
+        timing = self.collect_metrics
+        t0 = perf_counter_ns() if timing else 0
+        conn, cursor = self._get_conn_cursor()
+        with self._write_lock:
+            cursor.execute(
+                self._INSERT_SQL,
+                self._ROW_GETTER({**self._COLUMN_DEFAULTS, **data,
+                                  'name': name}))
+        self._invalidate_cached(name)
+        if timing:
+            self.metrics['store'].append(perf_counter_ns() - t0)
+        return name
+
+    def store_many(self, records):
+        """Store a mapping of name -> data dict in one transaction.
+
+        Convenience front end over the same executemany path batch_store
+        uses, for callers that already hold their records keyed by name.
+        """
+        self.batch_store([dict(data, name=name)
+                          for name, data in records.items()])
+
+    def retrieve(self, name, field):
+        """Return a single field for the named person, or None if absent."""
+        sql = self._SELECT_BY_FIELD.get(field)
+        if sql is None:
+            logger.error("Retrieve failed: Invalid field: %s", field)
+            return None
+        timing = self.collect_metrics
+        t0 = perf_counter_ns() if timing else 0
+        key = (name, field)
+        cache = self._retrieve_cache
+        with self._cache_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                value = cache[key]
+                if timing:
+                    self.metrics['retrieve'].append(perf_counter_ns() - t0)
+                return value
+        # The database round-trip happens outside the lock; a concurrent
+        # reader of the same key at worst duplicates the query.
+        conn, cursor = self._get_conn_cursor()
+        cursor.execute(sql, (name,))
+        row = cursor.fetchone()
+        value = row[0] if row else None
+        with self._cache_lock:
+            cache[key] = value
+            if len(cache) > self._retrieve_cache_max:
+                cache.popitem(last=False)
+        if timing:
+            self.metrics['retrieve'].append(perf_counter_ns() - t0)
+        return value
+
+    def batch_store(self, records, batch_size=1000):
+        """Store many records at once; returns the stored names.
+
+        Names are the primary key, so they are the batch's identifiers --
+        there is no rowid to hand back and nothing to re-query after the
+        insert.
+        """
+        if not records:
+            return []
+        # Validate every name up front -- a bad record must fail before any
+        # database work starts -- but defer the bind tuples to a generator
+        # that executemany drains directly, so a second full-size list of
+        # 10-tuples is never materialized alongside the input.
+        count = len(records)
+        names = [None] * count
+        for idx, r in enumerate(records):
+            name = r.get('name')
+            if not isinstance(name, str) or not name.strip():
+                raise ValueError("Every record needs a non-empty string name")
+            names[idx] = name
+        getter = self._ROW_GETTER
+        defaults = self._COLUMN_DEFAULTS
+        values = (getter({**defaults, **r}) for r in records)
+        t0 = perf_counter_ns()
+        conn, cursor = self._get_conn_cursor()
+        # The with block guarantees the lock is released even when BEGIN
+        # itself raises (e.g. a transaction already open on this
+        # connection); the inner try only guards statements that run
+        # inside a successfully opened transaction.
+        with self._write_lock:
+            cursor.execute("BEGIN")
+            try:
+                # One executemany round-trip for anything SQLite
+                # comfortably binds in a single call; only truly huge
+                # inputs are chunked, by slicing the same generator rather
+                # than copying lists.
+                if count <= 50000:
+                    cursor.executemany(self._INSERT_SQL, values)
+                else:
+                    for _ in range(0, count, batch_size):
+                        cursor.executemany(self._INSERT_SQL,
+                                           islice(values, batch_size))
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        with self._cache_lock:
+            cleared = (len(names) * len(self.VALID_COLUMNS)
+                       >= len(self._retrieve_cache))
+            if cleared:
+                self._retrieve_cache.clear()
+        if not cleared:
+            for n in names:
+                self._invalidate_cached(n)
+        dt_ns = perf_counter_ns() - t0
+        self.metrics['batch'].append(dt_ns)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Batch store rate: %.2f records/second",
+                         len(records) * 1e9 / dt_ns)
+        return names
+
+    def _invalidate_cached(self, name):
+        """Drop every cached field for a name after it is rewritten."""
+        pop = self._retrieve_cache.pop
+        with self._cache_lock:
+            for field in self.VALID_COLUMNS:
+                pop((name, field), None)
+
+    def verify_database(self):
+        """Check that the biographies table exists.
+
+        The schema is created when each epoch's first connection opens,
+        so the answer is cached instead of scanning sqlite_master per
+        call. close() invalidates the flag; the next operation's
+        reconnect restores it.
+        """
+        return self._schema_verified
+
+    def get_performance_metrics(self):
+        """Return the observed rate (calls/sec) per operation.
+
+        Computed as total calls over total time -- the harmonic mean --
+        rather than averaging per-call rates, which overweights fast calls.
+        """
+        return {op: (1e9 * len(durations) / sum(durations) if durations else 0)
+                for op, durations in self.metrics.items()}
+
+    def close(self):
+        """Close every thread's connection.
+
+        Safe to call repeatedly and after a reconnect: the connection
+        list is closed directly each time, while the finalizer stays
+        armed as a garbage-collection backstop for the same list. The
+        next operation reconnects and re-runs the schema setup; for an
+        in-memory database the data itself is gone with the last
+        connection.
+        """
+        _close_connections(self.connections)
+        self._epoch += 1
+        self._schema_verified = False
+        # Cached reads belong to the closed epoch; an in-memory database
+        # no longer even contains them.
+        with self._cache_lock:
+            self._retrieve_cache.clear()
@@ -0,0 +1,30 @@
+"""Backup management for the SQLite databases."""
+import logging
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+
+class BackupManager:
+    """Creates point-in-time copies of a live database."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def create_backup(self, backup_path):
+        """Back up the database using SQLite's online backup API.
+
+        Connection.backup copies only allocated pages, straight out of the
+        page cache where possible, and cooperates with concurrent WAL
+        readers -- unlike a filesystem copy, which must lock and duplicate
+        the whole page file including free pages.
+        """
+        src = sqlite3.connect(self.db_path)
+        dst = sqlite3.connect(backup_path)
+        try:
+            src.backup(dst, pages=1024)
+        finally:
+            dst.close()
+            src.close()
+        logger.debug("Backed up %s to %s", self.db_path, backup_path)
+        return backup_path
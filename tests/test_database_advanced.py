@@ -0,0 +1,282 @@
+"""Tests for the connection pool and air-quality database layer."""
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from database import AirQualityMemory, ConnectionPool, DatabaseInitializer
+from memory_manager import BackupManager
+
+# Shared statement/sample constants: one SQL string object means sqlite3's
+# statement cache hits on every insert instead of re-preparing per literal.
+AQ_INSERT_SQL = (
+    "INSERT INTO air_quality (city, region, year, month, day, station, "
+    "pm25, trend, aqi, co, no2, frequency, recorded_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+AQ_SAMPLE_ROW = ("Beijing", "North", 2024, 1, 1, "S1", 35.0, "up", 70.0,
+                 8.0, 35.0, "daily", "2024-01-01")
+
+
+def _aq_row(day):
+    """Sample row with the day (and date stamp) substituted in."""
+    return AQ_SAMPLE_ROW[:4] + (day,) + AQ_SAMPLE_ROW[5:12] + (
+        f"2024-01-{day:02d}",)
+
+
+def _apply_fast_pragmas(conn):
+    """Trade durability for speed on throwaway test databases.
+
+    Commits become memcpys: no rollback-journal file, no fsync, temp
+    structures in RAM. locking_mode=EXCLUSIVE is deliberately not set
+    because the shared-cache databases here are opened by several
+    connections at once.
+    """
+    conn.execute("PRAGMA journal_mode=MEMORY")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # In-memory shared-cache databases cannot run WAL, so concurrent
+    # writers rely on a generous busy_timeout instead of spinning on
+    # SQLITE_BUSY retries.
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+class TestConnectionPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # One shared-cache in-memory database for the whole class: no disk
+        # file, no fsync on commit, and the DDL runs once instead of per
+        # test. The anchor connection keeps the database alive.
+        cls.db_path = f"file:pool_{cls.__name__}?mode=memory&cache=shared"
+        cls.anchor = _apply_fast_pragmas(sqlite3.connect(
+            cls.db_path, uri=True, cached_statements=256))
+        cls.anchor.execute(
+            "CREATE TABLE test_data (id INTEGER PRIMARY KEY, value INTEGER)")
+        cls.anchor.commit()
+        # Pooled connections get the same pragmas on creation.
+        cls._orig_create = ConnectionPool._create_connection
+        ConnectionPool._create_connection = (
+            lambda pool: _apply_fast_pragmas(cls._orig_create(pool)))
+        cls.pool = ConnectionPool(cls.db_path, pool_size=5, uri=True)
+        # Worker threads are reused across tests instead of being created
+        # and torn down per test.
+        cls.executor = ThreadPoolExecutor(max_workers=10)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+        cls.pool.close_all()
+        ConnectionPool._create_connection = cls._orig_create
+        cls.anchor.close()
+
+    def setUp(self):
+        # Truncation restores a clean slate far cheaper than re-running DDL.
+        self.anchor.execute("DELETE FROM test_data")
+        self.anchor.commit()
+
+    def test_checkout_and_return(self):
+        conn = self.pool.get_connection()
+        self.assertIsNotNone(conn)
+        conn.execute("INSERT INTO test_data (value) VALUES (1)")
+        conn.commit()
+        self.pool.return_connection(conn)
+        count = self.anchor.execute(
+            "SELECT COUNT(*) FROM test_data").fetchone()[0]
+        self.assertEqual(count, 1)
+
+    def test_pool_exhaustion(self):
+        held = [self.pool.get_connection() for _ in range(5)]
+        with self.assertRaises(Exception):
+            self.pool.get_connection(timeout=0.1)
+        for conn in held:
+            self.pool.return_connection(conn)
+
+    def test_concurrent_connections(self):
+        errors = []
+        # Drawn up front: random shares one Mersenne Twister behind a lock,
+        # and nothing asserts on the values, so there is no reason to add
+        # RNG-lock contention to the section being stressed.
+        values = [random.randint(1, 100) for _ in range(10)]
+
+        def worker(value):
+            try:
+                conn = self.pool.get_connection()
+                try:
+                    conn.execute("INSERT INTO test_data (value) VALUES (?)",
+                                 (value,))
+                    conn.commit()
+                finally:
+                    self.pool.return_connection(conn)
+            except Exception as exc:  # noqa: BLE001
+                errors.append(exc)
+
+        list(self.executor.map(worker, values))
+
+        self.assertEqual(errors, [])
+        count = self.anchor.execute(
+            "SELECT COUNT(*) FROM test_data").fetchone()[0]
+        self.assertEqual(count, 10)
+
+
+class TestDatabaseInitializer(unittest.TestCase):
+    def setUp(self):
+        self.db_path = f"file:init_{id(self)}?mode=memory&cache=shared"
+        self.conn = _apply_fast_pragmas(
+            DatabaseInitializer.initialize_air_quality_db(
+                self.db_path, uri=True))
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_schema_created(self):
+        row = self.conn.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type='table' AND name='air_quality'").fetchone()
+        self.assertIsNotNone(row)
+
+    def test_indexes_created(self):
+        names = {r[0] for r in self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index'")}
+        self.assertIn('idx_aq_city', names)
+        self.assertIn('idx_aq_date', names)
+
+    def test_initialization_is_idempotent(self):
+        again = DatabaseInitializer.initialize_air_quality_db(
+            self.db_path, uri=True)
+        again.close()
+        self.test_schema_created()
+
+
+class TestAirQualityMemory(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.db_path = f"file:aq_{cls.__name__}?mode=memory&cache=shared"
+        cls.memory = AirQualityMemory(cls.db_path, uri=True)
+        _apply_fast_pragmas(cls.memory.conn)
+        cls.executor = ThreadPoolExecutor(max_workers=10)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+        cls.memory.close()
+
+    def setUp(self):
+        # Truncate rather than rebuild: DELETE FROM plus an AUTOINCREMENT
+        # counter reset restores a clean slate without re-running the DDL.
+        self.memory.conn.execute("DELETE FROM air_quality")
+        self.memory.conn.execute(
+            "DELETE FROM sqlite_sequence WHERE name='air_quality'")
+        self.memory.conn.commit()
+
+    def test_store_and_read_back(self):
+        self.memory.store_reading(AQ_SAMPLE_ROW)
+        readings = self.memory.get_readings("Beijing")
+        self.assertEqual(len(readings), 1)
+        self.assertEqual(self.memory.count(), 1)
+
+    def test_batched_storage(self):
+        # Data correctness of multi-row storage belongs to the bulk API:
+        # one transaction, one commit, no thread startup noise.
+        rows = [_aq_row(day) for day in range(1, 11)]
+        stored = self.memory.store_readings_bulk(rows)
+        self.assertEqual(stored, 10)
+        self.assertEqual(self.memory.count(), 10)
+
+    def test_concurrent_storage(self):
+        # Small smoke check that locking keeps concurrent single-row
+        # writers from corrupting anything; throughput is not the point.
+        errors = []
+
+        def worker(day):
+            try:
+                self.memory.store_reading(_aq_row(day))
+            except Exception as exc:  # noqa: BLE001
+                errors.append(exc)
+
+        list(self.executor.map(worker, range(1, 4)))
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.memory.count(), 3)
+
+
+class TestBackupManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Backups exercise real files, so these tests stay on disk -- but
+        # inside one private temp directory reclaimed wholesale in
+        # tearDownClass, not as loose files in the working directory.
+        cls.tmpdir = tempfile.mkdtemp(prefix="backup_tests_")
+        # Build the fixture database once: schema, pragmas and seed row are
+        # identical for every test, so per-test setUp just file-copies this
+        # template instead of re-running DDL and an insert each time.
+        cls.template_db = os.path.join(cls.tmpdir, "template.db")
+        conn = DatabaseInitializer.initialize_air_quality_db(cls.template_db)
+        # The one file-backed fixture: WAL lets the backup's reader run
+        # beside writers with a single sequential journal append per commit
+        # instead of two rollback-journal fsync cycles. journal_mode is
+        # persistent, so the copies inherit it.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA wal_autocheckpoint=10000")
+        conn.execute(AQ_INSERT_SQL, AQ_SAMPLE_ROW)
+        conn.commit()
+        # Checkpoint so the row lives in the main file, not a -wal sidecar
+        # the copy would miss.
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir, ignore_errors=True)
+
+    def setUp(self):
+        self.db_path = os.path.join(self.tmpdir,
+                                    f"{self._testMethodName}.db")
+        self.backup_path = f"{self.db_path}.bak"
+        shutil.copyfile(self.template_db, self.db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.manager = BackupManager(self.db_path)
+
+    def tearDown(self):
+        # Deterministic close; the files themselves are reclaimed by the
+        # single rmtree in tearDownClass.
+        self.conn.close()
+
+    def test_backup_creation(self):
+        self.manager.create_backup(self.backup_path)
+        self.assertTrue(os.path.exists(self.backup_path))
+
+    def test_backup_preserves_rows(self):
+        self.conn.execute("DELETE FROM air_quality")
+        self.conn.execute(AQ_INSERT_SQL, AQ_SAMPLE_ROW)
+        self.conn.commit()
+        self.manager.create_backup(self.backup_path)
+        copy = sqlite3.connect(self.backup_path)
+        try:
+            count = copy.execute(
+                "SELECT COUNT(*) FROM air_quality").fetchone()[0]
+            self.assertEqual(count, 1)
+        finally:
+            copy.close()
+
+    def test_backup_overwrites_previous(self):
+        self.manager.create_backup(self.backup_path)
+        self.conn.execute("DELETE FROM air_quality")
+        self.conn.execute(AQ_INSERT_SQL, AQ_SAMPLE_ROW)
+        self.conn.execute(AQ_INSERT_SQL, AQ_SAMPLE_ROW)
+        self.conn.commit()
+        self.manager.create_backup(self.backup_path)
+        copy = sqlite3.connect(self.backup_path)
+        try:
+            count = copy.execute(
+                "SELECT COUNT(*) FROM air_quality").fetchone()[0]
+            self.assertEqual(count, 2)
+        finally:
+            copy.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,335 @@
+"""Performance benchmarks for the SQLite-backed biographical stores."""
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import string
+import tempfile
+import threading
+import time
+import unittest
+
+from memory import BiographicalMemory
+
+logger = logging.getLogger(__name__)
+
+# Widths of the random text columns produced by generate_random_people.
+_TEXT_FIELDS = (
+    ('name', 10),
+    ('birth_place', 8),
+    ('death_place', 8),
+    ('occupation', 12),
+    ('achievement', 20),
+    ('education', 8),
+    ('known_for', 20),
+)
+
+
+def _open_conn(path, **kwargs):
+    """Open a raw sqlite3 connection with the benchmark pragma set.
+
+    The sqlite3 defaults (DELETE journal, synchronous=FULL) pay two fsyncs
+    per commit and keep a tiny page cache -- measurements against them say
+    more about the journal mode than the code under test. WAL plus
+    synchronous=NORMAL drops to one sequential append per commit, and the
+    larger cache/mmap keep warm reads off the filesystem.
+
+    isolation_level=None turns off the driver's implicit deferred BEGIN,
+    so transactions start and end exactly where the tests say BEGIN and
+    COMMIT -- nothing sneaks an extra commit into a timed region. The
+    bigger statement cache keeps every benchmark INSERT/SELECT compiled
+    across iterations.
+    """
+    conn = sqlite3.connect(path, isolation_level=None,
+                           cached_statements=512, check_same_thread=False,
+                           **kwargs)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+
+def generate_random_people(n):
+    """Fabricate n biography records in one vectorized pass.
+
+    A single numpy Generator.choice call produces every character for the
+    batch at once, instead of nine random.choices calls per record. Record
+    fabrication is test overhead, not the thing being measured, so it should
+    stay far cheaper than the database work it feeds.
+    """
+    import numpy as np  # deferred so the lighter tests run without NumPy
+
+    rng = np.random.default_rng()
+    letters = np.frombuffer(string.ascii_letters.encode(), dtype=np.uint8)
+    total_width = sum(width for _, width in _TEXT_FIELDS)
+    chars = rng.choice(letters, size=(n, total_width))
+    years = rng.integers(1800, 1990, size=n)
+
+    people = []
+    for i in range(n):
+        row = chars[i].tobytes().decode()
+        person = {}
+        offset = 0
+        for field, width in _TEXT_FIELDS:
+            person[field] = row[offset:offset + width]
+            offset += width
+        # Suffix the index so names stay unique across the batch.
+        person['name'] = f"{person['name']}_{i}"
+        person['birth_year'] = int(years[i])
+        person['death_year'] = int(years[i]) + 70
+        person['nationality'] = 'Unknown'
+        people.append(person)
+    return people
+
+
+def _staging_worker(args):
+    """Write one process's share of records into its private staging DB.
+
+    Module-level so multiprocessing can pickle it. Each process owns its
+    connection and its file, so there is no writer-lock or GIL contention;
+    the parent merges the staging files afterwards.
+    """
+    staging_path, worker_id, count = args
+    staging = BiographicalMemory(staging_path)
+    try:
+        staging.batch_store([
+            {'name': f"proc{worker_id}_{i}", 'birth_year': 1900 + i % 100,
+             'occupation': 'Tester'}
+            for i in range(count)
+        ])
+    finally:
+        staging.close()
+    return staging_path
+
+
+class TestDatabasePerformance(unittest.TestCase):
+    """Timing-oriented checks over raw sqlite3 and BiographicalMemory."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix="perf_tests_")
+        self.db_path = os.path.join(self.tmpdir, "performance.db")
+        self.conn = _open_conn(self.db_path)
+        self.cursor = self.conn.cursor()
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS biographical_data (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                birth_year INTEGER,
+                occupation TEXT
+            )
+        """)
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _generate_test_records(self, count):
+        """Build simple three-field records for the raw-table benchmarks.
+
+        Three Generator calls draw every choice for the batch at once;
+        the per-record random.choice/randint loop this replaces was the
+        slowest part of fixture setup at the larger counts.
+        """
+        import numpy as np  # deferred, as in generate_random_people
+
+        names = ['Alan', 'Ada', 'Grace', 'Edsger', 'Donald', 'Barbara']
+        occupations = ['Mathematician', 'Engineer', 'Physicist', 'Programmer']
+        rng = np.random.default_rng()
+        name_idx = rng.integers(0, len(names), size=count)
+        occ_idx = rng.integers(0, len(occupations), size=count)
+        years = rng.integers(1900, 2001, size=count)
+        return [{'name': f"{names[n]}_{i}",
+                 'birth_year': int(year),
+                 'occupation': occupations[o]}
+                for i, (n, year, o) in enumerate(zip(name_idx, years,
+                                                     occ_idx))]
+
+    def test_insertion_performance(self):
+        """Individual inserts vs one executemany batch."""
+        records = self._generate_test_records(200)
+
+        # One transaction around the whole loop: committing per row forces
+        # an fsync per insert and measures the disk, not the statements.
+        # The baseline stays "one execute per row"; only the commit moves.
+        start = time.perf_counter_ns()
+        self.conn.execute("BEGIN")
+        for record in records:
+            self.cursor.execute(
+                "INSERT INTO biographical_data (name, birth_year, occupation) "
+                "VALUES (?, ?, ?)",
+                (record['name'], record['birth_year'], record['occupation']))
+        self.conn.execute("COMMIT")
+        individual_time = (time.perf_counter_ns() - start) / 1e9
+
+        # Autocommit mode: the single DELETE commits on its own.
+        self.cursor.execute("DELETE FROM biographical_data")
+
+        start = time.perf_counter_ns()
+        self.conn.execute("BEGIN")
+        self.cursor.executemany(
+            "INSERT INTO biographical_data (name, birth_year, occupation) "
+            "VALUES (?, ?, ?)",
+            [(r['name'], r['birth_year'], r['occupation']) for r in records])
+        self.conn.execute("COMMIT")
+        batch_time = (time.perf_counter_ns() - start) / 1e9
+
+        count = self.cursor.execute(
+            "SELECT COUNT(*) FROM biographical_data").fetchone()[0]
+        self.assertEqual(count, len(records))
+        logger.info("insertion: individual=%.4fs batch=%.4fs",
+                    individual_time, batch_time)
+
+    def test_retrieval_performance(self):
+        """Random point lookups against a populated table."""
+        records = self._generate_test_records(1000)
+        self.conn.execute("BEGIN")
+        self.cursor.executemany(
+            "INSERT INTO biographical_data (name, birth_year, occupation) "
+            "VALUES (?, ?, ?)",
+            [(r['name'], r['birth_year'], r['occupation']) for r in records])
+        self.conn.execute("COMMIT")
+
+        # ORDER BY RANDOM() LIMIT 1 scans and shuffles the whole table per
+        # lookup -- it benchmarks the shuffle, not retrieval. Picking a
+        # random rowid in Python turns each query into a single B-tree
+        # descent, which is the access pattern retrieval actually has.
+        max_rowid = self.cursor.execute(
+            "SELECT MAX(rowid) FROM biographical_data").fetchone()[0]
+        start = time.perf_counter_ns()
+        for _ in range(100):
+            self.cursor.execute(
+                "SELECT * FROM biographical_data WHERE rowid = ?",
+                (random.randint(1, max_rowid),))
+            row = self.cursor.fetchone()
+            self.assertIsNotNone(row)
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+        logger.info("retrieval: 100 random lookups in %.4fs", elapsed)
+
+        # Sustained-read variant: the same hundred rows fetched as one
+        # statement. One parse, one execute, and a single fetchmany sized
+        # to the batch replaces a hundred execute/fetchone round-trips
+        # through the driver.
+        ids = [random.randint(1, max_rowid) for _ in range(100)]
+        placeholders = ", ".join("?" * len(ids))
+        start = time.perf_counter_ns()
+        self.cursor.arraysize = 100
+        self.cursor.execute(
+            "SELECT * FROM biographical_data WHERE rowid IN "
+            f"({placeholders})", ids)
+        rows = self.cursor.fetchmany(100)
+        batched = (time.perf_counter_ns() - start) / 1e9
+        self.assertGreater(len(rows), 0)
+        logger.info("retrieval: %d rows via one IN query in %.4fs",
+                    len(rows), batched)
+
+    def test_concurrent_performance(self):
+        """Several writer threads inserting against the same database.
+
+        SQLite allows one writer at a time regardless of how many
+        connections exist, so per-thread connections only move the
+        serialization down to file locks and busy retries. One shared
+        writer connection guarded by an in-process mutex gives the same
+        serialization without the per-thread open/PRAGMA setup.
+        """
+        thread_count = 5
+        operations_per_thread = 100
+        errors = []
+        writer = _open_conn(self.db_path)
+        writer_lock = threading.Lock()
+        # One explicit transaction spans the whole run; autocommit would
+        # otherwise commit every insert individually.
+        writer.execute("BEGIN")
+
+        def worker(worker_id):
+            try:
+                for i in range(operations_per_thread):
+                    with writer_lock:
+                        writer.execute(
+                            "INSERT INTO biographical_data "
+                            "(name, birth_year, occupation) VALUES (?, ?, ?)",
+                            (f"worker{worker_id}_{i}", 1900 + i % 100,
+                             'Tester'))
+            except Exception as exc:  # noqa: BLE001 - surfaced via errors list
+                errors.append(exc)
+
+        start = time.perf_counter_ns()
+        threads = [threading.Thread(target=worker, args=(t,))
+                   for t in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # One commit for the whole run, after every worker is done.
+        writer.execute("COMMIT")
+        writer.close()
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+
+        self.assertEqual(errors, [])
+        count = self.cursor.execute(
+            "SELECT COUNT(*) FROM biographical_data").fetchone()[0]
+        self.assertEqual(count, thread_count * operations_per_thread)
+        logger.info("concurrent: %d inserts across %d threads in %.4fs",
+                    count, thread_count, elapsed)
+
+    def test_multiprocess_throughput(self):
+        """Parallel writers in separate processes, merged in one pass.
+
+        Threads measure SQLite's writer lock plus the GIL rather than
+        throughput; separate processes each write their own staging
+        database and the parent folds them into the main one with a single
+        INSERT ... SELECT per staging file.
+        """
+        num_procs = 4
+        records_per_proc = 250
+        main_path = os.path.join(self.tmpdir, "merged.db")
+        jobs = [(os.path.join(self.tmpdir, f"staging_{p}.db"), p,
+                 records_per_proc) for p in range(num_procs)]
+
+        start = time.perf_counter_ns()
+        with multiprocessing.Pool(num_procs) as pool:
+            staging_paths = pool.map(_staging_worker, jobs)
+
+        memory = BiographicalMemory(main_path)
+        try:
+            conn = memory.get_connection()
+            columns = ', '.join(BiographicalMemory.VALID_COLUMNS)
+            with memory._write_lock:
+                for i, path in enumerate(staging_paths):
+                    conn.execute(f"ATTACH DATABASE ? AS staging_{i}", (path,))
+                    conn.execute(
+                        f"INSERT INTO biographies ({columns}) "
+                        f"SELECT {columns} FROM staging_{i}.biographies")
+                    conn.execute(f"DETACH DATABASE staging_{i}")
+            elapsed = (time.perf_counter_ns() - start) / 1e9
+            count = conn.execute(
+                "SELECT COUNT(*) FROM biographies").fetchone()[0]
+            self.assertEqual(count, num_procs * records_per_proc)
+            logger.info("multiprocess: %d inserts via %d processes in %.4fs",
+                        count, num_procs, elapsed)
+        finally:
+            memory.close()
+
+    def test_database_size(self):
+        """Bulk-store fabricated people and sanity-check the file size."""
+        memory_db_path = os.path.join(self.tmpdir, "size.db")
+        memory = BiographicalMemory(memory_db_path)
+        try:
+            people = generate_random_people(1000)
+            memory.batch_store(people)
+            self.assertEqual(
+                len(people),
+                memory.get_connection().execute(
+                    "SELECT COUNT(*) FROM biographies").fetchone()[0])
+            size = os.path.getsize(memory_db_path)
+            self.assertGreater(size, 0)
+            logger.info("database size for 1000 records: %d bytes", size)
+        finally:
+            memory.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""Functional tests for BiographicalMemory."""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from memory import BiographicalMemory
+
+TURING = {
+    'birth_year': 1912,
+    'birth_place': 'London',
+    'death_year': 1954,
+    'occupation': 'Computer Scientist',
+    'achievement': 'Breaking the Enigma code',
+    'nationality': 'British',
+    'known_for': 'Turing machine',
+}
+LOVELACE = {
+    'birth_year': 1815,
+    'birth_place': 'London',
+    'death_year': 1852,
+    'occupation': 'Mathematician',
+    'achievement': 'First computer program',
+    'nationality': 'British',
+    'known_for': 'Analytical Engine notes',
+}
+
+
+class TestBiographicalMemory(unittest.TestCase):
+    """Field retrieval against a store built once for the class.
+
+    The database lives in memory (mode=memory with a shared cache, so
+    every per-thread connection sees the same pages) and is populated a
+    single time in setUpClass; the tests only read, so nothing needs
+    resetting between them and no file is ever written to disk.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.memory = BiographicalMemory(
+            "file:bio_test?mode=memory&cache=shared")
+        cls.memory.store_many({'Alan Turing': TURING,
+                               'Ada Lovelace': LOVELACE})
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.memory.close()
+
+    def test_turing_birth_year(self):
+        self.assertEqual(
+            self.memory.retrieve('Alan Turing', 'birth_year'), 1912)
+
+    def test_turing_occupation(self):
+        self.assertEqual(
+            self.memory.retrieve('Alan Turing', 'occupation'),
+            'Computer Scientist')
+
+    def test_lovelace_birth_year(self):
+        self.assertEqual(
+            self.memory.retrieve('Ada Lovelace', 'birth_year'), 1815)
+
+    def test_lovelace_occupation(self):
+        self.assertEqual(
+            self.memory.retrieve('Ada Lovelace', 'occupation'),
+            'Mathematician')
+
+
+class TestReconnect(unittest.TestCase):
+    """close() is an interruption, not the end of the object's life."""
+
+    def test_reuse_after_close_in_memory(self):
+        db = BiographicalMemory("file:bio_reuse?mode=memory&cache=shared")
+        db.store('Alan Turing', TURING)
+        db.close()
+        # The in-memory database died with its last connection: the
+        # reconnect must re-create the schema (and find it empty), not
+        # raise or replay stale cached reads.
+        self.assertIsNone(db.retrieve('Alan Turing', 'birth_year'))
+        db.store('Ada Lovelace', LOVELACE)
+        self.assertEqual(db.retrieve('Ada Lovelace', 'birth_year'), 1815)
+        self.assertTrue(db.verify_database())
+        db.close()
+
+    def test_reuse_after_close_on_file(self):
+        tmpdir = tempfile.mkdtemp(prefix="bio_reopen_")
+        self.addCleanup(shutil.rmtree, tmpdir, ignore_errors=True)
+        db = BiographicalMemory(os.path.join(tmpdir, "bio.db"))
+        self.addCleanup(db.close)
+        db.store('Alan Turing', TURING)
+        db.close()
+        # File-backed data survives the close; only the connections die.
+        self.assertEqual(db.retrieve('Alan Turing', 'birth_year'), 1912)
+        self.assertTrue(db.verify_database())
+
+
+class TestConcurrentReaders(unittest.TestCase):
+    """Readers must stay lock-free while a writer holds a transaction.
+
+    File-backed stores run in WAL with one private page cache per
+    connection; a shared cache would turn every read during a write into
+    an immediate 'database table is locked' error.
+    """
+
+    def test_retrieve_during_batch_store(self):
+        tmpdir = tempfile.mkdtemp(prefix="bio_wal_")
+        self.addCleanup(shutil.rmtree, tmpdir, ignore_errors=True)
+        db = BiographicalMemory(os.path.join(tmpdir, "bio.db"))
+        self.addCleanup(db.close)
+        names = [f"Person {i}" for i in range(200)]
+        records = [dict(TURING, name=n) for n in names]
+        db.batch_store(records)
+        errors = []
+        stop = threading.Event()
+
+        def writer():
+            try:
+                while not stop.is_set():
+                    db.batch_store(records)
+            except Exception as exc:  # noqa: BLE001
+                errors.append(exc)
+                stop.set()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(5):
+                for name in names:
+                    # Fresh cache per lookup so every retrieve really hits
+                    # SQLite while the writer's transaction is open.
+                    with db._cache_lock:
+                        db._retrieve_cache.clear()
+                    self.assertEqual(db.retrieve(name, 'birth_year'), 1912)
+        finally:
+            stop.set()
+            thread.join()
+        self.assertEqual(errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
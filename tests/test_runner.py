@@ -0,0 +1,536 @@
+"""Colorized unittest runner with per-class and per-category summaries.
+
+Run the whole suite with ``python tests/test_runner.py``; pass category
+names as arguments to run only the tests tagged (via a ``categories``
+attribute on the test class) with one of them.
+"""
+import atexit
+import io
+import pickle
+import sys
+import time
+import unittest
+from collections import defaultdict
+from pathlib import Path
+
+try:
+    from colorama import Fore, Style, init as colorama_init
+    colorama_init()
+    _COLORS = {
+        'green': Fore.GREEN,
+        'red': Fore.RED,
+        'yellow': Fore.YELLOW,
+        'cyan': Fore.CYAN,
+        'reset': Style.RESET_ALL,
+    }
+except ImportError:  # colorama is optional; fall back to plain output
+    _COLORS = {'green': '', 'red': '', 'yellow': '', 'cyan': '', 'reset': ''}
+
+# Shared default for tests that declare no categories: one singleton
+# instead of a fresh empty container per test.
+_EMPTY = frozenset()
+
+# Placeholder stored for tests without a docstring; a single shared
+# object, so stopTest can recognize it by identity and every undocumented
+# test points at the same string instead of allocating its own.
+_NO_DESC = "No description provided"
+
+
+class ColorTestResult(unittest.TestResult):
+    """Test result that prints colored per-test lines and keeps summaries.
+
+    Bookkeeping is two-level dicts keyed by class name then test name:
+    flipping a test to failed is a pair of dict lookups, not a scan over
+    the class's test list.
+    """
+
+    def __init__(self, stream, use_colors=True, show_docstrings=True,
+                 slow_threshold=0.5, categories=None):
+        super().__init__()
+        self.stream = stream
+        self.use_colors = use_colors
+        self.show_docstrings = show_docstrings
+        self.slow_threshold = slow_threshold
+        # Threshold in integer nanoseconds: the per-test comparison in the
+        # summary is then int vs int, with no float conversion.
+        self._slow_ns = int(slow_threshold * 1e9)
+        self.categories = set(categories) if categories else None
+        # class name -> {test name: passed}; insertion order preserves
+        # discovery order for the summary.
+        self.tests_by_class = {}
+        self.test_times = {}
+        self.test_docs = {}
+        self.test_categories = {}
+        # Aggregates maintained at source: stopTest adds each elapsed time
+        # (integer nanoseconds, like test_times) to its class's total and
+        # startTest files the test under its categories, so the summaries
+        # read them instead of rescanning every test per class and per
+        # category.
+        self.class_totals = defaultdict(int)
+        self.category_tests = defaultdict(list)
+        # Display orders, sorted once in stopTestRun and shared by both
+        # summary sections instead of re-sorting per section.
+        self._sorted_classes = None
+        self._sorted_categories = None
+        self._start_time = None
+        # colored() specialized at config time: one closure per config
+        # rather than a use_colors branch per call.
+        if use_colors:
+            self.colored = (lambda text, color, _colors=_COLORS,
+                            _reset=_COLORS['reset']:
+                            f"{_colors[color]}{text}{_reset}")
+        else:
+            self.colored = lambda text, color: text
+        # Final status strings, escapes and all, built once here; the add*
+        # hooks store one of these and stopTest writes it straight into
+        # the line with no per-test colored() call.
+        self._pass_status = self.colored("PASS", 'green')
+        self._fail_status = self.colored("FAIL", 'red')
+        self._error_status = self.colored("ERROR", 'red')
+        self._skip_status = self.colored("SKIP", 'yellow')
+        # Status of the test currently running, stashed by the add* hooks
+        # and emitted as one line (one write syscall) in stopTest.
+        self._status = self._pass_status
+        # Identity of the running test -- a (class name, method name)
+        # tuple, which doubles as the key into test_times/test_docs/
+        # test_categories -- resolved once in startTest so stopTest and
+        # the add* hooks reuse it instead of re-fetching attributes.
+        self._current = (None, None)
+        # The test object _current was resolved from, so the failure hooks
+        # can tell a running test apart from class- or module-level
+        # _ErrorHolder events that never went through startTest.
+        self._current_test = None
+        self._filtered = False
+
+    def startTest(self, test):
+        # Base-class bookkeeping runs unconditionally, before any filter
+        # decision: stopTest fires for every test, and skipping
+        # super().startTest for filtered tests would leave the two
+        # counters out of step.
+        super().startTest(test)
+        cats = getattr(test, 'categories', _EMPTY)
+        # Filter check first, on that one getattr: a filtered test pays no
+        # doc capture or dict bookkeeping and reports nothing.
+        self._filtered = (self.categories is not None
+                          and not self.categories.intersection(cats))
+        if self._filtered:
+            return
+        class_name = test.__class__.__name__
+        test_name = test._testMethodName
+        # The tuple itself is the dict key: hashing two already-interned
+        # strings, with no "Class.method" string built per bookkeeping op.
+        key = (class_name, test_name)
+        self._current = key
+        self._current_test = test
+        self.tests_by_class.setdefault(class_name, {})[test_name] = True
+        if self.show_docstrings:
+            # Capture only when the per-test lines will show it; interning
+            # makes tests sharing a docstring (parametrized helpers) share
+            # one string object in the dict.
+            doc = test.shortDescription()
+            self.test_docs[key] = sys.intern(doc) if doc else _NO_DESC
+        self.test_categories[key] = tuple(cats)
+        for cat in cats:
+            self.category_tests[cat].append((class_name, test_name))
+        self._status = self._pass_status
+        self._start_time = time.perf_counter_ns()
+
+    def stopTest(self, test):
+        """Emit the whole per-test line as a single unflushed write.
+
+        The add* hooks only record the outcome; building glyph, name and
+        docstring into one string here means one stream.write per test
+        instead of several, and no flush until the run ends -- on a piped
+        or TTY stream the per-test flushes were one syscall each.
+        """
+        if self._filtered:
+            super().stopTest(test)
+            return
+        # Durations stay integer nanoseconds on this path; the float
+        # conversion and "%.3f" formatting happen once, at summary time.
+        key = self._current
+        class_name, test_name = key
+        elapsed = time.perf_counter_ns() - self._start_time
+        self.test_times[key] = elapsed
+        self.class_totals[class_name] += elapsed
+        # The display form is built only here, where it is actually shown.
+        line = f"  {self._status} {class_name}.{test_name}"
+        if self.show_docstrings:
+            doc = self.test_docs[key]
+            # Identity check against the shared placeholder, not a string
+            # comparison.
+            if doc is not _NO_DESC:
+                line += f" -- {doc}"
+        self.stream.write(line + "\n")
+        super().stopTest(test)
+
+    def _mark_test_failed(self, test):
+        if self._filtered:
+            return
+        if test is not self._current_test:
+            # setUpClass/setUpModule errors arrive as _ErrorHolder objects
+            # with no startTest, so _current still points at the previous
+            # test (or at nothing). They are counted in self.errors; there
+            # is no per-test row to flip.
+            return
+        class_name, test_name = self._current
+        self.tests_by_class[class_name][test_name] = False
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self._status = self._pass_status
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._mark_test_failed(test)
+        self._status = self._error_status
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._mark_test_failed(test)
+        self._status = self._fail_status
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._status = self._skip_status
+
+    def stopTestRun(self):
+        super().stopTestRun()
+        self._sorted_classes = sorted(self.tests_by_class)
+        self._sorted_categories = sorted(self.category_tests)
+
+    def _print_summary(self):
+        # Fixed-config strings built once, outside the per-test loop: the
+        # status and SLOW tags come out identical for every line, so there
+        # is no reason to re-run colored()'s branch and dict lookups per
+        # line.
+        if self.use_colors:
+            c_cyan, reset = _COLORS['cyan'], _COLORS['reset']
+            slow_tag = f"{_COLORS['yellow']} SLOW{reset}"
+        else:
+            c_cyan = reset = ''
+            slow_tag = " SLOW"
+        pass_status, fail_status = self._pass_status, self._fail_status
+        # Accumulate the whole block and emit it as one write: the stream
+        # sees a single string instead of a call per line, and _finish's
+        # flush sends it in one go.
+        out = ["\n" + "=" * 70 + "\n",
+               f"{c_cyan}Results by class{reset}\n"]
+        classes = self._sorted_classes
+        if classes is None:  # result used without the runner's stopTestRun
+            classes = sorted(self.tests_by_class)
+        for class_name in classes:
+            outcomes = self.tests_by_class[class_name]
+            passed = sum(1 for ok in outcomes.values() if ok)
+            out.append(
+                f"{class_name}: {passed}/{len(outcomes)} "
+                f"({self.class_totals[class_name] / 1e9:.3f}s)\n")
+            for test_name, ok in outcomes.items():
+                status = pass_status if ok else fail_status
+                elapsed_ns = self.test_times.get((class_name, test_name), 0)
+                line = f"    {status} {test_name} ({elapsed_ns / 1e9:.3f}s)"
+                if elapsed_ns >= self._slow_ns:
+                    line += slow_tag
+                out.append(line + "\n")
+        self.stream.write("".join(out))
+
+    def _print_categories_summary(self):
+        if not self.category_tests:
+            return
+        out = ["\n" + self.colored("Results by category\n", 'cyan')]
+        categories = self._sorted_categories
+        if categories is None:
+            categories = sorted(self.category_tests)
+        for category in categories:
+            members = self.category_tests[category]
+            passed = sum(1 for class_name, test_name in members
+                         if self.tests_by_class[class_name][test_name])
+            out.append(f"{category}: {passed}/{len(members)}\n")
+        self.stream.write("".join(out))
+
+
+class ColorTestRunner:
+    """Runs a suite through ColorTestResult and prints the summaries."""
+
+    def __init__(self, stream=None, use_colors=True, show_docstrings=True,
+                 slow_threshold=0.5, categories=None):
+        stream = stream if stream is not None else sys.stdout
+        # When output goes to a pipe or file, re-wrap the sink in a 64 KiB
+        # buffer so the per-test lines coalesce into a handful of write
+        # syscalls. A TTY is left alone: interactively, lines should appear
+        # as tests finish. The wrapper does not own the caller's stream:
+        # _finish detaches it after the final flush, so collecting the
+        # runner never closes sys.stdout underneath later writers.
+        self._raw_stream = stream
+        self._buffered = False
+        buffer = getattr(stream, 'buffer', None)
+        if buffer is not None and not stream.isatty():
+            stream = io.TextIOWrapper(
+                io.BufferedWriter(buffer, buffer_size=65536),
+                line_buffering=False, write_through=False)
+            self._buffered = True
+        self.stream = stream
+        self.use_colors = use_colors
+        self.show_docstrings = show_docstrings
+        self.slow_threshold = slow_threshold
+        self.categories = categories
+
+    def _make_result(self):
+        return ColorTestResult(self.stream, use_colors=self.use_colors,
+                               show_docstrings=self.show_docstrings,
+                               slow_threshold=self.slow_threshold,
+                               categories=self.categories)
+
+    def _finish(self, result, elapsed):
+        """Print the summaries and footer; always flushes."""
+        # suite.run does not fire this hook (only TestProgram does), and
+        # the parallel path merges results without running a suite at
+        # all; it sorts the display orders once for both sections below.
+        result.stopTestRun()
+        try:
+            for heading, entries in (("FAIL", result.failures),
+                                     ("ERROR", result.errors)):
+                for test, tb in entries:
+                    # The parallel path stores the id string in place of
+                    # the (unpicklable) test object.
+                    name = test if isinstance(test, str) else test.id()
+                    self.stream.write(
+                        f"\n{'=' * 70}\n{heading}: {name}\n"
+                        f"{'-' * 70}\n{tb}")
+            result._print_summary()
+            result._print_categories_summary()
+            self.stream.write(
+                f"\nRan {result.testsRun} tests in {elapsed:.3f}s\n")
+            if result.wasSuccessful():
+                self.stream.write(result.colored("OK\n", 'green'))
+            else:
+                self.stream.write(result.colored(
+                    f"FAILED (failures={len(result.failures)}, "
+                    f"errors={len(result.errors)})\n", 'red'))
+        finally:
+            # Everything above may sit in the 64 KiB buffer; this is the
+            # one flush the run is guaranteed to make.
+            self.stream.flush()
+            if self._buffered:
+                # Detach both wrapper layers to hand the underlying buffer
+                # back to the caller's stream; otherwise their eventual
+                # collection closes the whole stdout chain. Later runs on
+                # this runner write straight to the original stream.
+                self.stream.detach().detach()
+                self.stream = self._raw_stream
+                self._buffered = False
+
+    def run(self, suite):
+        if self.categories:
+            suite = unittest.TestSuite(
+                _filter_by_categories(_iter_tests(suite), self.categories))
+        result = self._make_result()
+        start = time.time()
+        try:
+            suite.run(result)
+        finally:
+            self._finish(result, time.time() - start)
+        return result
+
+    def run_parallel(self, suite, jobs):
+        """Run the suite across worker processes and merge their results.
+
+        The suite is flattened to dotted test ids, dealt round-robin into
+        one chunk per worker, and each worker runs its chunk in a spawned
+        process (spawn behaves the same on every platform and inherits no
+        parent state). The parent replays each worker's per-test output
+        as it completes and folds the bookkeeping into one result for the
+        usual summaries. Tests that share module-level state must run in
+        the serial path.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        import multiprocessing
+
+        tests = list(_iter_tests(suite))
+        if self.categories:
+            tests = _filter_by_categories(tests, self.categories)
+        test_ids = sorted(
+            tid for tid in (test.id() for test in tests)
+            if not tid.startswith('unittest.loader'))
+        chunks = [chunk for chunk in
+                  (test_ids[i::jobs] for i in range(jobs)) if chunk]
+        result = self._make_result()
+        start = time.time()
+        try:
+            ctx = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=len(chunks),
+                                     mp_context=ctx) as pool:
+                jobs_args = [(chunk, self.categories) for chunk in chunks]
+                for worker in pool.map(_run_worker, jobs_args):
+                    self.stream.write(worker['output'])
+                    for cls, outcomes in worker['tests_by_class'].items():
+                        result.tests_by_class.setdefault(
+                            cls, {}).update(outcomes)
+                    result.test_times.update(worker['test_times'])
+                    result.test_docs.update(worker['test_docs'])
+                    result.test_categories.update(worker['test_categories'])
+                    for cls, total in worker['class_totals'].items():
+                        result.class_totals[cls] += total
+                    for cat, members in worker['category_tests'].items():
+                        result.category_tests[cat].extend(members)
+                    result.failures.extend(worker['failures'])
+                    result.errors.extend(worker['errors'])
+                    result.testsRun += worker['testsRun']
+        finally:
+            self._finish(result, time.time() - start)
+        return result
+
+
+def _run_worker(args):
+    """Run one chunk of test ids in a worker process.
+
+    Module-level so spawn can pickle it. Everything returned is plain
+    picklable data; the failure/error entries carry the test id string in
+    place of the (unpicklable) test object.
+    """
+    test_ids, categories = args
+    suite = unittest.TestLoader().loadTestsFromNames(test_ids)
+    buf = io.StringIO()
+    result = ColorTestResult(buf, use_colors=False, categories=categories)
+    suite.run(result)
+    return {
+        'output': buf.getvalue(),
+        'tests_by_class': result.tests_by_class,
+        'test_times': result.test_times,
+        'test_docs': result.test_docs,
+        'test_categories': result.test_categories,
+        'class_totals': dict(result.class_totals),
+        'category_tests': {cat: list(members) for cat, members
+                           in result.category_tests.items()},
+        'failures': [(test.id(), tb) for test, tb in result.failures],
+        'errors': [(test.id(), tb) for test, tb in result.errors],
+        'testsRun': result.testsRun,
+    }
+
+
+_TESTS_DIR = Path(__file__).resolve().parent
+_REPO_ROOT = _TESTS_DIR.parent
+_CACHE_PATH = _TESTS_DIR / '.cache' / '_discovery_cache.pkl'
+
+
+def _discovery_signature():
+    """Fingerprint of every test file's path and mtime under tests/."""
+    return tuple(sorted(
+        (p.relative_to(_TESTS_DIR).as_posix(), p.stat().st_mtime_ns)
+        for p in _TESTS_DIR.rglob('test_*.py')))
+
+
+def _iter_tests(suite):
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from _iter_tests(item)
+        else:
+            yield item
+
+
+def _iter_test_ids(suite):
+    for test in _iter_tests(suite):
+        yield test.id()
+
+
+def _filter_by_categories(tests, categories):
+    """Keep only the tests tagged with one of the given categories.
+
+    Filtering happens before the run, so an excluded test never
+    executes and contributes nothing to failures, errors or testsRun --
+    the summaries, exit status and "Ran N tests" all describe exactly
+    the tests that ran.
+    """
+    wanted = set(categories)
+    return [test for test in tests
+            if wanted.intersection(getattr(test, 'categories', _EMPTY))]
+
+
+def _discover(loader):
+    """Load the suite, skipping the filesystem walk when nothing changed.
+
+    discover() walks tests/, imports every module and rebuilds the suite
+    tree on each run. The resolved test ids are cached alongside a
+    signature of the test files' mtimes; while the signature holds,
+    loadTestsFromNames rebuilds the same suite straight from the ids. Any
+    problem with the cache -- missing, stale format, ids that no longer
+    load -- falls through to a full discovery that rewrites it.
+    """
+    signature = _discovery_signature()
+    try:
+        with open(_CACHE_PATH, 'rb') as fh:
+            cached = pickle.load(fh)
+        if cached.get('signature') == signature:
+            return loader.loadTestsFromNames(cached['test_ids'])
+    except Exception:  # noqa: BLE001 - any cache failure means rediscover
+        pass
+    # Absolute start dir and an explicit top level: discovery works from
+    # any cwd and yields "tests.<module>" ids resolvable from the repo
+    # root.
+    suite = loader.discover(str(_TESTS_DIR), pattern='test_*.py',
+                            top_level_dir=str(_REPO_ROOT))
+    all_ids = list(_iter_test_ids(suite))
+    # 'unittest.loader' ids are the stubs discover() plants for modules
+    # that failed to import.
+    test_ids = sorted(
+        tid for tid in all_ids if not tid.startswith('unittest.loader'))
+    if len(test_ids) < len(all_ids):
+        # A broken import is not a discovery result: caching the surviving
+        # ids would replay this run as a clean (possibly empty) suite and
+        # keep skipping the failed module until a test file's mtime
+        # happens to change. Leave the cache alone so the next run
+        # rediscovers.
+        return suite
+    try:
+        _CACHE_PATH.parent.mkdir(exist_ok=True)
+        with open(_CACHE_PATH, 'wb') as fh:
+            pickle.dump({'signature': signature, 'test_ids': test_ids}, fh)
+    except OSError:
+        pass
+    return suite
+
+
+def run_tests(categories=None, jobs=1):
+    """Discover everything under tests/ and run it through the runner."""
+    if not sys.stdout.isatty():
+        # Captured output (CI, pipes, redirection): drop line buffering on
+        # both standard streams so anything the tests themselves print
+        # coalesces into block-sized writes, and guarantee a final drain
+        # at interpreter exit. The runner's own stream gets the same
+        # treatment from its 64 KiB wrapper.
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+        sys.stderr.reconfigure(line_buffering=False, write_through=False)
+        atexit.register(sys.stdout.flush)
+        atexit.register(sys.stderr.flush)
+    loader = unittest.TestLoader()
+    suite = _discover(loader)
+    runner = ColorTestRunner(categories=categories)
+    if jobs > 1:
+        result = runner.run_parallel(suite, jobs)
+    else:
+        result = runner.run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+def _parse_args(argv):
+    """Split argv into (categories, jobs); everything non-flag is a
+    category name."""
+    jobs = 1
+    categories = []
+    it = iter(argv)
+    for arg in it:
+        if arg == '--jobs':
+            jobs = int(next(it))
+        elif arg.startswith('--jobs='):
+            jobs = int(arg.split('=', 1)[1])
+        else:
+            categories.append(arg)
+    return categories or None, jobs
+
+
+if __name__ == '__main__':
+    # Running as a script puts tests/ at sys.path[0]; the modules under
+    # test live at the repo root, so put that on the path too.
+    sys.path.insert(0, str(_REPO_ROOT))
+    _categories, _jobs = _parse_args(sys.argv[1:])
+    sys.exit(run_tests(categories=_categories, jobs=_jobs))
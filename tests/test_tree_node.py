@@ -0,0 +1,107 @@
+"""Tests for the byte-pattern tree structures."""
+import unittest
+
+from tree_node import TreeNode, TreeForest, NodePool, build_tree
+
+
+class TestTreeNode(unittest.TestCase):
+    def test_new_node_has_no_children(self):
+        node = TreeNode("11000000")
+        self.assertEqual(node.byte, "11000000")
+        self.assertTrue(all(node.get_child(i) is None for i in range(8)))
+
+    def test_byte_pattern_parsed_to_int(self):
+        node = TreeNode("11000001")
+        self.assertEqual(node.byte_int, 0b11000001)
+        self.assertTrue(node.bit_set(0))
+        self.assertFalse(node.bit_set(2))
+        self.assertTrue(node.bit_set(7))
+
+    def test_set_and_get_child(self):
+        parent = TreeNode("11000000")
+        child = TreeNode("10000000")
+        parent.set_child(3, child)
+        self.assertIs(parent.get_child(3), child)
+
+    def test_child_index_bounds(self):
+        # Bounds come from list indexing itself: out-of-range raises,
+        # negative indices count from the end like any sequence.
+        node = TreeNode("11000000")
+        with self.assertRaises(IndexError):
+            node.set_child(8, TreeNode("00000000"))
+        node.set_child(7, 'last')
+        self.assertEqual(node.get_child(-1), 'last')
+
+    def test_leaf_value(self):
+        node = TreeNode("00000000")
+        self.assertFalse(node.is_leaf())
+        node.set_value("Alan Turing")
+        self.assertTrue(node.is_leaf())
+        self.assertIn("Alan Turing", str(node))
+
+    def test_build_tree(self):
+        root = build_tree({'name': 'Alan Turing', 'birth_year': 1912})
+        personal = root.get_child(0)
+        self.assertEqual(personal.get_child(0), 'Alan Turing')
+        self.assertEqual(personal.get_child(1), 1912)
+        self.assertEqual(personal.get_child(2), '')
+
+
+class TestNodePool(unittest.TestCase):
+    def test_pooled_children_round_trip(self):
+        pool = NodePool()
+        parent = pool.new_node("11000000")
+        child = pool.new_node("10000000")
+        self.assertIsNone(parent.get_child(3))
+        parent.set_child(3, child)
+        self.assertIs(parent.get_child(3), child)
+        child.set_value("Alan Turing")
+        self.assertTrue(child.is_leaf())
+
+    def test_pool_capacity(self):
+        pool = NodePool()
+        for _ in range(128):
+            pool.new_node("00000000")
+        with self.assertRaises(IndexError):
+            pool.new_node("00000000")
+
+
+class TestTreeForest(unittest.TestCase):
+    def test_build_tree_round_trip(self):
+        forest = TreeForest(capacity=16)
+        root = forest.build_tree({'name': 'Ada Lovelace', 'birth_year': 1815})
+        personal = forest.get_child(root, 0)
+        name_leaf = forest.get_child(personal, 0)
+        self.assertTrue(forest.is_leaf(name_leaf))
+        self.assertEqual(forest.leaves[name_leaf], 'Ada Lovelace')
+        self.assertEqual(forest.get_child(root, 7), -1)
+
+    def test_capacity_limit(self):
+        forest = TreeForest(capacity=1)
+        forest.add_node("10000000")
+        with self.assertRaises(IndexError):
+            forest.add_node("10000000")
+
+    def test_leaf_bitmap(self):
+        forest = TreeForest(capacity=16)
+        forest.build_tree({'name': 'Ada Lovelace'})
+        self.assertEqual(list(forest.leaf_indices()), list(range(1, 9)))
+        idx = forest.add_node("00000000")
+        self.assertFalse(forest.is_leaf(idx))
+        forest.node(idx).set_value('Charles Babbage')
+        self.assertTrue(forest.is_leaf(idx))
+
+    def test_bulk_add_and_node_view(self):
+        forest = TreeForest(capacity=4)
+        indices = forest.add_nodes(["11100000", "10000000", "00000001"])
+        self.assertEqual(list(indices), [0, 1, 2])
+        self.assertEqual(list(forest.bytes[:3]), [0b11100000, 0b10000000, 1])
+        view = forest.node(0)
+        view.set_child(0, forest.node(1))
+        self.assertEqual(view.byte, "11100000")
+        self.assertEqual(view.get_child(0).idx, 1)
+        self.assertIsNone(view.get_child(7))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,294 @@
+"""8-ary tree nodes addressed by byte-pattern strings like "11000000"."""
+import array
+
+# Bit in TreeNode._flags marking a node that carries a leaf value.
+_LEAF = 0x01
+
+# Template for a pooled node's empty child table; copied by slicing, which
+# is one C-level memcpy instead of re-parsing the initializer list.
+_NO_CHILDREN = array.array('b', [-1] * 8)
+
+
+class TreeNode:
+    """One branch of the tree, tagged with its byte pattern.
+
+    __slots__ drops the per-instance __dict__, which for a three-field
+    object is most of its footprint; trees are built from thousands of
+    these, so the saving is per node, not per class.
+    """
+
+    __slots__ = ('byte', 'byte_int', 'children', 'value', '_flags')
+
+    @staticmethod
+    def _parse_byte(s):
+        """Parse an "11000000"-style pattern to its integer value.
+
+        One int(s, 2) C call; parsing once at construction lets every
+        later bit test work on the integer instead of indexing and
+        comparing characters.
+        """
+        return int(s, 2)
+
+    def __init__(self, byte_value):
+        self.byte = byte_value
+        self.byte_int = self._parse_byte(byte_value)
+        # Allocated on first set_child. Most nodes in a populated tree are
+        # leaves, and a leaf never needs the 8-slot list -- deferring it
+        # saves the list object on exactly the nodes that dominate.
+        self.children = None
+        self.value = None
+        self._flags = 0
+
+    def bit_set(self, position):
+        """True when the pattern bit at position (0 = leftmost) is 1."""
+        return bool(self.byte_int & (0x80 >> position))
+
+    def set_child(self, index, child):
+        """Attach a child (TreeNode or str) at the given 3-bit position.
+
+        Indexing does its own bounds check; list.__setitem__ raises
+        IndexError for anything outside -8..7 without a Python-level
+        branch on this hot path.
+        """
+        if self.children is None:
+            self.children = [None] * 8
+        self.children[index] = child
+
+    def get_child(self, index):
+        """Return the child at the given position, or None."""
+        if self.children is None:
+            return None
+        return self.children[index]
+
+    def set_value(self, value):
+        """Mark this node as a leaf carrying the given value."""
+        self.value = value
+        self._flags |= _LEAF
+
+    def is_leaf(self):
+        """True when this node carries a value rather than children.
+
+        Reads the flag bit set by set_value: one int AND, with no
+        comparison against the (possibly falsy) value itself.
+        """
+        return bool(self._flags & _LEAF)
+
+    def __str__(self):
+        if self.is_leaf():
+            return f"TreeNode(byte={self.byte}, value={self.value})"
+        present = sum(1 for child in self.children or () if child is not None)
+        return f"TreeNode(byte={self.byte}, children={present})"
+
+
+def build_tree(data):
+    """Build the two-level tree for one biographical record."""
+    # Build the children list in one expression instead of eight
+    # set_child calls: one list allocation replacing the [None]*8
+    # placeholder plus eight method dispatches, on the per-record path.
+    g = data.get
+    personal = TreeNode("11100000")
+    personal.children = [g('name', ''), g('birth_year', ''),
+                         g('birth_place', ''), g('death_year', ''),
+                         g('death_place', ''), g('occupation', ''),
+                         g('achievement', ''), g('education', '')]
+
+    root = TreeNode("11100000")
+    root.set_child(0, personal)
+    return root
+
+
+class NodePool:
+    """Pool of nodes whose child links are int8 indices, not pointers.
+
+    A TreeNode's children list holds eight PyObject pointers plus the
+    list header -- around 120 bytes per branch node. When every child is
+    itself a node (no inline string leaves), the links can instead be
+    one-byte indices into this pool: an array.array('b') of eight int8s,
+    8 bytes of payload. Trees that mix node and string children should
+    keep using plain TreeNode; the choice is made at construction by
+    which class allocates the node.
+    """
+
+    __slots__ = ('nodes',)
+
+    def __init__(self):
+        self.nodes = []
+
+    def new_node(self, byte_value):
+        """Allocate a pooled node; raises once int8 indices run out."""
+        if len(self.nodes) > 127:
+            raise IndexError("NodePool capacity exhausted (int8 indices)")
+        node = PooledTreeNode(self, len(self.nodes), byte_value)
+        self.nodes.append(node)
+        return node
+
+
+class PooledTreeNode(TreeNode):
+    """TreeNode variant whose children are indices into a NodePool."""
+
+    __slots__ = ('pool', 'idx')
+
+    def __init__(self, pool, idx, byte_value):
+        super().__init__(byte_value)
+        self.pool = pool
+        self.idx = idx
+
+    def set_child(self, index, child):
+        """Attach another pooled node at the given 3-bit position."""
+        if self.children is None:
+            self.children = _NO_CHILDREN[:]
+        self.children[index] = child.idx
+
+    def get_child(self, index):
+        """Return the child node at the given position, or None."""
+        if self.children is None:
+            return None
+        child_idx = self.children[index]
+        if child_idx < 0:
+            return None
+        return self.pool.nodes[child_idx]
+
+    def __str__(self):
+        if self.is_leaf():
+            return f"TreeNode(byte={self.byte}, value={self.value})"
+        present = sum(1 for child_idx in self.children or () if child_idx >= 0)
+        return f"TreeNode(byte={self.byte}, children={present})"
+
+
+class TreeForest:
+    """Structure-of-arrays storage for many tree nodes at once.
+
+    A TreeNode costs a couple hundred bytes of Python object overhead for
+    what is semantically a byte tag plus eight child links. TreeForest packs
+    the same information into three parallel arrays -- a uint8 per node, an
+    int32 child-index table, and an object array for leaf values -- cutting
+    per-node memory by an order of magnitude and keeping traversals walking
+    contiguous memory. Nodes are referred to by integer index; -1 means no
+    child.
+    """
+
+    def __init__(self, capacity):
+        import numpy as np
+
+        self.bytes = np.zeros(capacity, dtype=np.uint8)
+        self.children = np.full((capacity, 8), -1, dtype=np.int32)
+        self.leaves = np.empty(capacity, dtype=object)
+        # One bit per node, set when the node carries a value; lets bulk
+        # leaf discovery run as one C-level bitmap scan instead of a
+        # Python loop over the object array.
+        self.leaf_bits = np.zeros((capacity + 7) // 8, dtype=np.uint8)
+        self.n = 0
+
+    def _mark_leaf(self, idx):
+        self.leaf_bits[idx >> 3] |= 0x80 >> (idx & 7)
+
+    def add_node(self, byte_value, value=None):
+        """Allocate a node; byte_value is the "11000000"-style pattern."""
+        if self.n >= len(self.bytes):
+            raise IndexError("TreeForest capacity exhausted")
+        idx = self.n
+        self.bytes[idx] = int(byte_value, 2)
+        self.leaves[idx] = value
+        if value is not None:
+            self._mark_leaf(idx)
+        self.n += 1
+        return idx
+
+    def add_nodes(self, byte_values):
+        """Allocate a batch of nodes at once; returns their indices.
+
+        The bit strings are concatenated and parsed in one
+        frombuffer/packbits pass -- eight chars become one uint8 with no
+        per-node Python parsing -- and written into the byte array as a
+        single slice assignment.
+        """
+        import numpy as np
+
+        joined = ''.join(byte_values)
+        count = len(joined) // 8
+        if self.n + count > len(self.bytes):
+            raise IndexError("TreeForest capacity exhausted")
+        bits = np.frombuffer(joined.encode(), dtype=np.uint8) - ord('0')
+        start = self.n
+        self.bytes[start:start + count] = np.packbits(bits)
+        self.n += count
+        return range(start, start + count)
+
+    def node(self, idx):
+        """Return a TreeNode-shaped view of the node at idx."""
+        return TreeForestNode(self, idx)
+
+    def set_child(self, parent_idx, position, child_idx):
+        """Link child_idx under parent_idx at the given 3-bit position."""
+        self.children[parent_idx, position] = child_idx
+
+    def get_child(self, parent_idx, position):
+        """Return the child index at position, or -1 when absent."""
+        return int(self.children[parent_idx, position])
+
+    def set_value(self, idx, value):
+        """Store a leaf value at idx and flip its bit in the leaf bitmap."""
+        self.leaves[idx] = value
+        self._mark_leaf(idx)
+
+    def is_leaf(self, idx):
+        """True when the node at idx carries a value."""
+        return bool(self.leaf_bits[idx >> 3] & (0x80 >> (idx & 7)))
+
+    def leaf_indices(self):
+        """Indices of every leaf node, found by one vectorized bitmap scan."""
+        import numpy as np
+
+        return np.unpackbits(self.leaf_bits, count=self.n).nonzero()[0]
+
+    def build_tree(self, data):
+        """SoA equivalent of build_tree; returns the root node index."""
+        personal = self.add_node("11100000")
+        fields = ('name', 'birth_year', 'birth_place', 'death_year',
+                  'death_place', 'occupation', 'achievement', 'education')
+        for position, field in enumerate(fields):
+            leaf = self.add_node("00000000", value=data.get(field, ''))
+            self.set_child(personal, position, leaf)
+
+        root = self.add_node("11100000")
+        self.set_child(root, 0, personal)
+        return root
+
+
+class TreeForestNode:
+    """Thin TreeNode-shaped view over one TreeForest slot.
+
+    Holds only the forest reference and an index; the data stays in the
+    forest's arrays, so views can be created and dropped freely during a
+    traversal without copying anything out of the SoA layout.
+    """
+
+    __slots__ = ('forest', 'idx')
+
+    def __init__(self, forest, idx):
+        self.forest = forest
+        self.idx = idx
+
+    @property
+    def byte(self):
+        return format(int(self.forest.bytes[self.idx]), '08b')
+
+    @property
+    def value(self):
+        return self.forest.leaves[self.idx]
+
+    def set_child(self, index, child):
+        child_idx = child.idx if isinstance(child, TreeForestNode) else child
+        self.forest.set_child(self.idx, index, child_idx)
+
+    def get_child(self, index):
+        child_idx = self.forest.get_child(self.idx, index)
+        if child_idx < 0:
+            return None
+        return TreeForestNode(self.forest, child_idx)
+
+    def set_value(self, value):
+        self.forest.set_value(self.idx, value)
+
+    def is_leaf(self):
+        return self.forest.is_leaf(self.idx)